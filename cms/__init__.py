@@ -1,8 +1,10 @@
 """Main file."""
 
+import functools
 import os
+import re
 import shutil
-from typing import Optional
+from typing import Callable, Iterator, NamedTuple, Optional
 
 from flask import Flask, redirect, render_template, request, url_for
 
@@ -15,42 +17,52 @@ app = Flask(__name__)
 _PROJECT_TEMPLATE = "src/project_template"
 _COLLAPSED_DIRS = {"static", TEMPLATE_DIR}
 
-
-def _create_dirs():
-    os.makedirs(PROJECT_DIR, exist_ok=True)
+os.makedirs(PROJECT_DIR, exist_ok=True)
 
 
 @app.get("/")
 def index():
     """Serve index page with project selection and creation."""
-    _create_dirs()
-
     projects = os.listdir(PROJECT_DIR)
     projects.sort()
 
     return render_template("index.html", projects=projects)
 
 
+@functools.lru_cache(maxsize=8)
+def _name_matcher(chars: str) -> Callable[[str], Optional[re.Match]]:
+    return re.compile(f"[A-Za-z0-9{re.escape(chars)}]+").fullmatch
+
+
 def _check_path_name(name: str, label: str, chars: str) -> Optional[str]:
     if not name:
         return f"Kein {label}"
 
-    clean_name = name
-    for char in chars:
-        clean_name = clean_name.replace(char, "c")
-
-    if not name.isascii() or not clean_name.isalnum():
+    if not _name_matcher(chars)(name):
         return (
             f"Der {label} darf nur aus Buchstaben (keine Umlaute), Zahlen und "
             f"{', '.join(chars)} bestehen."
         )
 
 
+def _clone_template(src: str, dst: str):
+    with os.scandir(src) as scan:
+        entries = list(scan)
+
+    os.mkdir(dst)
+
+    for entry in entries:
+        target = os.path.join(dst, entry.name)
+
+        if entry.is_dir():
+            _clone_template(entry.path, target)
+        else:
+            shutil.copyfile(entry.path, target)
+
+
 @app.post("/create-project")
 def create_project():
     """Create a new project."""
-    _create_dirs()
-
     project_name = request.form.get("project-name", "").strip()
 
     if (msg := _check_path_name(project_name, "Projektname", "-")) is not None:
@@ -58,47 +70,133 @@ def create_project():
         return msg
 
     try:
-        shutil.copytree(
-            _PROJECT_TEMPLATE,
-            f"{PROJECT_DIR}/{project_name}",
-            copy_function=shutil.copy,
-        )
+        _clone_template(_PROJECT_TEMPLATE, f"{PROJECT_DIR}/{project_name}")
     except FileExistsError:
         return "Ein Projekt unter dem Projektnamen existiert bereits."
 
     return redirect(url_for("project", path=project_name))
 
 
-def _get_item(path: str, root: bool = True) -> Item:
-    urlpath = path.replace(PROJECT_DIR + "/", "")
-    inner_path = urlpath.split("/", 1)[-1]
+def _scan(path: str, mtimes: dict[str, int]) -> list[os.DirEntry]:
+    try:
+        mtimes[path] = os.stat(path).st_mtime_ns
+
+        with os.scandir(path) as scan:
+            return sorted(scan, key=lambda entry: entry.name)
+    except (FileNotFoundError, NotADirectoryError):
+        mtimes.pop(path, None)
+        return []
+
+
+def _get_file(urlpath: str, collapsed: bool) -> Item:
+    if not collapsed and urlpath.endswith(".html"):
+        return HTMLFile(urlpath)
+
+    return File(urlpath)
+
+
+class _Frame(NamedTuple):
+    urlpath: str
+    depth: int
+    collapsed: bool
+    entries: Iterator[os.DirEntry]
+    children: list
+
 
-    if inner_path.split("/", 1)[0] not in _COLLAPSED_DIRS:
-        if path.endswith(".html"):
-            # TODO: Check if os.path.isfile is True
-            return HTMLFile(urlpath)
+def _get_folder(
+    path: str,
+    urlpath: str,
+    depth: int,
+    collapsed: bool,
+    mtimes: dict[str, int],
+) -> Item:
+    stack = [_Frame(urlpath, depth, collapsed, iter(_scan(path, mtimes)), [])]
 
-    if "." in path:
-        # TODO: Check if os.path.isfile is True
-        return File(urlpath)
+    while True:
+        frame = stack[-1]
+        entry = next(frame.entries, None)
 
-    children = []
+        if entry is None:
+            stack.pop()
+
+            # Collapsed folders only exist directly inside a project.
+            if frame.collapsed and frame.depth == 1:
+                folder = CollapsedFolder(frame.urlpath, frame.children)
+            else:
+                folder = Folder(frame.urlpath, frame.children)
+
+            if not stack:
+                return folder
+
+            stack[-1].children.append(folder)
+            continue
+
+        urlpath = f"{frame.urlpath}/{entry.name}"
+        depth = frame.depth + 1
+        collapsed = frame.collapsed or (
+            frame.depth == 0 and entry.name in _COLLAPSED_DIRS
+        )
+
+        if not entry.is_dir(follow_symlinks=False):
+            frame.children.append(_get_file(urlpath, collapsed))
+        elif collapsed and depth == 1:
+            # The tree view only shows the size of a collapsed folder, so
+            # its children are only built when the folder itself is shown.
+            size = len(_scan(entry.path, mtimes))
+            frame.children.append(CollapsedFolder(urlpath, [], size=size))
+        else:
+            entries = iter(_scan(entry.path, mtimes))
+            stack.append(_Frame(urlpath, depth, collapsed, entries, []))
+
+
+_tree_cache: dict[str, tuple[Item, dict[str, int]]] = {}
+
+
+def _is_unchanged(mtimes: dict[str, int]) -> bool:
+    try:
+        return all(
+            os.stat(path).st_mtime_ns == mtime
+            for path, mtime in mtimes.items()
+        )
+    except FileNotFoundError:
+        return False
+
+
+def _get_item(path: str) -> Item:
+    urlpath = path.replace(PROJECT_DIR + "/", "")
+    inner_path = urlpath.partition("/")[2]
+    depth = inner_path.count("/") + 1 if inner_path else 0
+    collapsed = inner_path.partition("/")[0] in _COLLAPSED_DIRS
 
     if os.path.isdir(path):
-        for subpath in sorted(os.listdir(path)):
-            children.append(_get_item(f"{path}/{subpath}", False))
+        is_dir = True
+    elif os.path.exists(path):
+        is_dir = False
+    else:
+        # Items that are about to be created are guessed from their name.
+        is_dir = "." not in path
+
+    if not is_dir:
+        return _get_file(urlpath, collapsed)
 
-    if inner_path in _COLLAPSED_DIRS:
-        return CollapsedFolder(urlpath, children)
+    cached = _tree_cache.get(path)
+    if cached is not None and _is_unchanged(cached[1]):
+        return cached[0]
 
-    return Folder(urlpath, children)
+    mtimes: dict[str, int] = {}
+    item = _get_folder(path, urlpath, depth, collapsed, mtimes)
+
+    if path in mtimes:
+        _tree_cache[path] = (item, mtimes)
+    else:
+        _tree_cache.pop(path, None)
+
+    return item
 
 
 @app.get("/project/<path:path>")
 def project(path: str):
     """Show a project item."""
-    _create_dirs()
-
     fullpath = f"{PROJECT_DIR}/{path}"
 
     if not os.path.exists(fullpath):
@@ -112,8 +210,6 @@ def project(path: str):
 @app.post("/update-item/<path:path>")
 def update_item(path: str):
     """Update a project item."""
-    _create_dirs()
-
     if not os.path.exists(f"{PROJECT_DIR}/{path.split('/')[0]}"):
         return "404"
 
@@ -128,8 +224,6 @@ def update_item(path: str):
 @app.post("/create-item/<path:path>")
 def create_item(path: str):
     """Create a project item."""
-    _create_dirs()
-
     parent_path = f"{PROJECT_DIR}/{path}"
 
     if not os.path.exists(parent_path):
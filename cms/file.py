@@ -1,20 +1,29 @@
 """Module containing different file items."""
 
 import hashlib
+import io
 import os
-from typing import NamedTuple, Optional
+import re
+from typing import Iterator, NamedTuple, Optional
 
-import jinja2
-import jinja2.nodes
-from flask import render_template, request
-
-from .item import Item
+from .item import Item, render_cached
 
 TEMPLATE_DIR = "templates"
 
 
-def _hash(content: str) -> str:
-    return hashlib.sha256(content.encode()).hexdigest()
+def _hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def _hash_file(file) -> str:
+    if hasattr(hashlib, "file_digest"):
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+    # hashlib.file_digest is only available from Python 3.11 on.
+    digest = hashlib.sha256()
+    while chunk := file.read(65536):
+        digest.update(chunk)
+    return digest.hexdigest()
 
 
 def _normalize(content: str) -> str:
@@ -30,15 +39,17 @@ class File(Item):
 
     def render(self, **kwargs):
         """Render the file for HTML display."""
-        with open(self.fullpath, "r") as file:
-            content = file.read()
+        with open(self.fullpath, "rb") as file:
+            raw = file.read()
 
-        content_hash = _hash(content)
+        content_hash = _hash(raw)
 
         if "form" in kwargs:
             content = kwargs["form"]["content"]
+        else:
+            content = raw.decode()
 
-        return render_template(
+        return render_cached(
             "project_file.html",
             path=self.path,
             content=_normalize(content),
@@ -60,14 +71,14 @@ class File(Item):
 
     def update(self, form: dict[str, str]) -> Optional[str]:
         """Process the post action on the file."""
-        content_hash = request.form.get("content_hash")
+        content_hash = form.get("content_hash")
 
         if content_hash is None:
             return "Fehler beim Bearbeiten."
 
         try:
-            with open(self.fullpath, "r+") as file:
-                if _hash(file.read()) != content_hash:
+            with open(self.fullpath, "rb+") as file:
+                if _hash_file(file) != content_hash:
                     return (
                         "Datei wurde während des Bearbeiten auf der "
                         "Festplatte verändert. Erneut auf Speichern klicken "
@@ -75,81 +86,129 @@ class File(Item):
                     )
 
                 file.seek(0)
-                self._write(file, form)
-                file.truncate()
+                with io.TextIOWrapper(file, encoding="utf-8") as text:
+                    self._write(text, form)
+                    text.truncate()
         except FileNotFoundError:
-            with open(self.fullpath, "w") as file:
+            with open(self.fullpath, "w", encoding="utf-8") as file:
                 self._write(file, form)
 
 
-def _is_template(content: str) -> bool:
-    for item in jinja2.Environment().parse(content).body:
-        if isinstance(item, jinja2.nodes.Block):
-            return True
-    return False
-
+# Comments, raw sections and expressions are matched as a whole so tags
+# inside them are skipped, like the Jinja lexer does. Jinja rejects unclosed
+# openers, so the rest of the text after one is consumed in a single match
+# instead of being rescanned from every later opener.
+_TAG_RE = re.compile(
+    rb"""
+    {\#(?:.*?\#}|.*)
+    | {%[-+]?\s*raw\s*[-+]?%}(?:.*?{%[-+]?\s*endraw\s*[-+]?%}|.*)
+    | {{(?:"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^"'}]|}(?!}))*}}
+    | {%(?P<lstrip>[-+]?)\s*(?!\s)(?P<tag>\w*)(?!\w)
+      (?P<args>(?:"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'|[^"'%]|%(?!}))*?)
+      (?P<rstrip>[-+]?)%}
+    | {[%{].*
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+_NAME_RE = re.compile(rb"\s*(\w*)")
+_STRING_RE = re.compile(rb"""\s*(["'])(.*?)\1""")
+
+
+def _iter_tags(content: bytes) -> Iterator[re.Match]:
+    for match in _TAG_RE.finditer(content):
+        if match["tag"] in (b"block", b"endblock", b"extends"):
+            yield match
+
+
+def _get_template(content: bytes) -> str:
+    depth = 0
+
+    for match in _iter_tags(content):
+        if match["tag"] == b"block":
+            depth += 1
+        elif match["tag"] == b"endblock":
+            depth = max(depth - 1, 0)
+        elif depth == 0:
+            string = _STRING_RE.match(match["args"])
+            return string[2].decode() if string is not None else ""
 
-def _get_template(content: str) -> str:
-    for item in jinja2.Environment().parse(content).body:
-        if isinstance(item, jinja2.nodes.Extends):
-            return item.template.as_const()
     return ""
 
 
-class _Token(NamedTuple):
-    lineno: int
-    ttype: str
-    value: str
+def _get_fields(content: bytes) -> dict[str, str]:
+    fields = {}
+    depth = 0
+
+    for match in _iter_tags(content):
+        if match["tag"] == b"block":
+            if depth == 0:
+                name = _NAME_RE.match(match["args"])[1].decode()
+                start = match.end()
+                lstrip = match["rstrip"] == b"-"
+            depth += 1
+        elif match["tag"] == b"endblock" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                body = content[start : match.start()].decode()
+                if lstrip:
+                    body = body.lstrip()
+                if match["lstrip"] == b"-":
+                    body = body.rstrip()
+                fields[name] = _normalize(body)
 
+    return fields
 
-def _parse_block(stream) -> str:
-    depth = 1
-    data = ""
 
-    while True:
-        token = _Token(*next(stream))
-        buffer = token.value
+def _is_template(content: str) -> bool:
+    return bool(_get_fields(content.encode()))
 
-        if token.ttype == "block_begin":
-            while (token := _Token(*next(stream))).ttype != "name":
-                buffer += token.value
 
-            if token.value == "endblock":
-                depth -= 1
-                if depth <= 0:
-                    break
-            elif token.value == "block":
-                depth += 1
+_Parsed = tuple[str, dict[str, str]]
 
-            buffer += token.value
+_parse_cache: dict[str, tuple[tuple[int, int], _Parsed]] = {}
 
-        data += buffer
 
-    return data
+def _get_parsed(
+    path: str,
+    content: Optional[bytes] = None,
+    stat: Optional[os.stat_result] = None,
+) -> _Parsed:
+    if stat is None:
+        stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
 
+    cached = _parse_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
 
-def _get_fields(content: str) -> dict[str, str]:
-    fields = {}
-    stream = jinja2.Environment().lex(content)
+    if content is None:
+        with open(path, "rb") as file:
+            content = file.read()
 
-    def until(stream, ttype: str) -> _Token:
-        while (token := _Token(*next(stream))).ttype != ttype:
-            pass
-        return token
+    parsed = (_get_template(content), _get_fields(content))
 
-    for token in stream:
-        if _Token(*token).ttype != "block_begin":
-            continue
+    _parse_cache[path] = (stamp, parsed)
+    return parsed
 
-        if until(stream, "name").value != "block":
-            continue
 
-        name = until(stream, "name").value
-        until(stream, "block_end")
+_templates_cache: dict[str, tuple[int, frozenset[str]]] = {}
 
-        fields[name] = _normalize(_parse_block(stream))
 
-    return fields
+def _get_templates(project_dir: str) -> frozenset[str]:
+    template_dir = os.path.join(project_dir, TEMPLATE_DIR)
+    mtime = os.stat(template_dir).st_mtime_ns
+
+    cached = _templates_cache.get(template_dir)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    templates = frozenset(
+        os.path.join(TEMPLATE_DIR, template)
+        for template in os.listdir(template_dir)
+    )
+
+    _templates_cache[template_dir] = (mtime, templates)
+    return templates
 
 
 class _HTMLField(NamedTuple):
@@ -168,16 +227,11 @@ class HTMLFile(File):
 
     def render(self, **kwargs):
         """Render the HTML file for HTML display."""
-        project_template_dir = os.path.join(self.project_dir, TEMPLATE_DIR)
-        templates = {
-            os.path.join(TEMPLATE_DIR, template)
-            for template in os.listdir(project_template_dir)
-        }
-
-        with open(self.fullpath) as file:
-            content = file.read()
+        with open(self.fullpath, "rb") as file:
+            stat = os.fstat(file.fileno())
+            raw = file.read()
 
-        content_hash = _hash(content)
+        content_hash = _hash(raw)
 
         if "form" in kwargs:
             template = kwargs["form"]["template"]
@@ -193,37 +247,35 @@ class HTMLFile(File):
                     "", "", kwargs["form"]["content"], True
                 )
         else:
-            template = _get_template(content)
+            template, content_fields = _get_parsed(self.fullpath, raw, stat)
 
             if template:
-                with open(os.path.join(self.project_dir, template)) as file:
-                    fields = {
-                        name: _HTMLField("field_", placeholder, "", True)
-                        for name, placeholder in _get_fields(
-                            file.read()
-                        ).items()
-                    }
-
-                fields.update(
-                    {
-                        name: _HTMLField(
-                            "field_",
-                            fields[name].placeholder if name in fields else "",
-                            value,
-                            name in fields,
-                        )
-                        for name, value in _get_fields(content).items()
-                    }
+                _, parent_fields = _get_parsed(
+                    os.path.join(self.project_dir, template)
                 )
+
+                fields = {
+                    name: _HTMLField(
+                        "field_",
+                        parent_fields.get(name, ""),
+                        content_fields.get(name, ""),
+                        name in parent_fields,
+                    )
+                    for name in {**parent_fields, **content_fields}
+                }
             else:
                 fields = {
-                    "content": _HTMLField("", "", _normalize(content), True)
+                    "content": _HTMLField(
+                        "", "", _normalize(raw.decode()), True
+                    )
                 }
 
+        templates = _get_templates(self.project_dir)
+
         if template:
-            templates.add(template)
+            templates = templates | {template}
 
-        return render_template(
+        return render_cached(
             "project_html.html",
             path=self.path,
             template=template,
@@ -234,13 +286,13 @@ class HTMLFile(File):
         )
 
     def _write(self, file, form: dict[str, str]):
-        template = request.form.get("template", "")
+        template = form.get("template", "")
 
-        content = request.form.get("content")
+        content = form.get("content")
 
         fields = {
             key[len("field_") :]: value
-            for key, value in request.form.items()
+            for key, value in form.items()
             if key.startswith("field_")
         }
 
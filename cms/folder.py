@@ -3,9 +3,7 @@
 import os
 from typing import Optional
 
-from flask import render_template
-
-from .item import Item
+from .item import Item, render_cached
 
 
 class Folder(Item):
@@ -17,7 +15,7 @@ class Folder(Item):
 
     def render(self, **kwargs):
         """Render the folder for HTML display."""
-        return render_template(
+        return render_cached(
             "project_dir.html",
             path=self.path,
             tree=self.children,
@@ -35,16 +33,27 @@ class Folder(Item):
 class CollapsedFolder(Folder):
     """Class for a folder whose content is hidden in the tree view."""
 
-    def __init__(self, path: str, children: list, icon: str = "📁"):
-        """Initialize a collapsed folder."""
+    def __init__(
+        self,
+        path: str,
+        children: list,
+        icon: str = "📁",
+        size: Optional[int] = None,
+    ):
+        """Initialize a collapsed folder.
+
+        If only the number of children is known, it can be passed as size
+        instead of the children themselves.
+        """
         super().__init__(path, [], icon)
         self._children = children
-        plural = "e" if len(children) != 1 else ""
-        self.suffix = f" ({len(children)} Element{plural})"
+        if size is None:
+            size = len(children)
+        self.suffix = f" ({size} Element{'' if size == 1 else 'e'})"
 
     def render(self, **kwargs):
         """Render the folder for HTML display."""
-        return render_template(
+        return render_cached(
             "project_dir.html",
             path=self.path,
             tree=self._children,
@@ -1,11 +1,27 @@
 """Module containing base class for items."""
 
+import functools
 import os
 from typing import Optional
 
+import jinja2
+from flask import current_app
+
 PROJECT_DIR = "projects"
 
 
+@functools.lru_cache(maxsize=None)
+def _load_template(name: str) -> jinja2.Template:
+    return current_app.jinja_env.get_template(name)
+
+
+def render_cached(name: str, **context) -> str:
+    """Render an app template, reusing the loaded template object."""
+    if current_app.jinja_env.auto_reload:
+        return current_app.jinja_env.get_template(name).render(context)
+    return _load_template(name).render(context)
+
+
 class Item:
     """Base class for an item."""
 
@@ -16,16 +32,8 @@ class Item:
         self.name = path.strip(os.sep).split(os.sep)[-1]
         self.suffix = ""
         self.children = children
-
-    @property
-    def fullpath(self) -> str:
-        """Get the full path required to open the item from python."""
-        return os.path.join(PROJECT_DIR, self.path)
-
-    @property
-    def project_dir(self) -> str:
-        """Get the path to the project directory containing the item."""
-        return os.path.join(PROJECT_DIR, self.path.split(os.sep)[0])
+        self.fullpath = os.path.join(PROJECT_DIR, path)
+        self.project_dir = os.path.join(PROJECT_DIR, path.split(os.sep, 1)[0])
 
     def render(self, **kwargs):
         """Render the item for HTML display."""
@@ -0,0 +1,41 @@
+"""Tests for the file module."""
+
+import time
+
+import pytest
+
+_UNCLOSED = {
+    "statement": b"{% " * 5000,
+    "expression": b"{{ " * 5000,
+    "string": b'{% "' * 3000,
+    "raw": b"{% raw %}" * 5000,
+    "comment": b"{# " * 5000,
+    "word": b"{% " + b"a" * 20000,
+}
+
+
+@pytest.fixture
+def file_module(tmp_path, monkeypatch):
+    """Import cms.file without creating the projects folder in the repo."""
+    monkeypatch.chdir(tmp_path)
+    from cms import file
+
+    return file
+
+
+@pytest.mark.parametrize("content", _UNCLOSED.values(), ids=_UNCLOSED.keys())
+def test_unclosed_openers_scan_in_linear_time(file_module, content):
+    """Unclosed openers must not make the tag scan quadratic."""
+    start = time.perf_counter()
+    file_module._get_fields(content)
+    file_module._get_template(content)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_tags_in_comments_raw_and_expressions_are_ignored(file_module):
+    """Only real block tags become fields."""
+    content = (
+        b"{# {% block c %} #}{% raw %}{% block r %}{% endraw %}"
+        b'{{ "{% block e %}" }}{% block a %}x{% endblock %}'
+    )
+    assert file_module._get_fields(content) == {"a": "x"}